@@ -0,0 +1,434 @@
+# backend/admission.py
+import asyncio
+import bisect
+import itertools
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from enum import IntEnum
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """요청 우선순위 (값이 작을수록 먼저 처리)"""
+    CRITICAL = 0  # 안전 관련 (위험도 조회, 안전 경로)
+    NORMAL = 1
+    LOW = 2  # 비용이 큰 요청 (음성, 이미지)
+
+
+# 워커당 동시 처리 요청 수
+MAX_INFLIGHT = int(os.getenv("ADMISSION_MAX_INFLIGHT", "64"))
+# 안전 관련 요청 전용으로 남겨두는 슬롯 수
+RESERVED_CRITICAL = int(os.getenv("ADMISSION_RESERVED_CRITICAL", "8"))
+# 대기열 최대 길이 (초과 시 낮은 우선순위부터 거절)
+MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "128"))
+
+# 사용자·우선순위 등급별 토큰 버킷 (모든 워커 합계 기준 초당 충전량, 최대 보유량)
+# 등급마다 버킷이 따로 있으므로 한 사용자가 모든 등급을 합쳐 쓸 수 있는 양은 최대 등급 수(3)배
+RATE_LIMIT_RATE = float(os.getenv("RATE_LIMIT_RATE", "5"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "20"))
+
+# 워커별 지표 스냅샷 디렉터리 (설정 시 모든 워커 지표를 합산해서 제공)
+METRICS_DIR = os.getenv("ADMISSION_METRICS_DIR", "")
+METRICS_INTERVAL = float(os.getenv("ADMISSION_METRICS_INTERVAL", "5"))
+
+# ROUTE_POLICIES에 없는 경로는 모두 이 키로 집계
+OTHER_ROUTE = "other"
+
+DEFAULT_POLICY = {"priority": Priority.NORMAL, "max_concurrency": None, "max_wait": 3.0, "cost": 1}
+
+# 경로별 정책 (cost: 요청당 소모 토큰, max_wait: 최대 대기 시간(초))
+ROUTE_POLICIES: Dict[str, Dict[str, Any]] = {
+    "/api/health": {"priority": Priority.CRITICAL, "max_concurrency": None, "max_wait": 1.0, "cost": 0},
+    "/api/location/risk": {"priority": Priority.CRITICAL, "max_concurrency": None, "max_wait": 5.0, "cost": 1},
+    "/api/navigation/safe-route": {"priority": Priority.CRITICAL, "max_concurrency": None, "max_wait": 5.0, "cost": 1},
+    "/api/voice/query": {"priority": Priority.LOW, "max_concurrency": 4, "max_wait": 2.0, "cost": 5},
+    "/api/image/analyze": {"priority": Priority.LOW, "max_concurrency": 4, "max_wait": 2.0, "cost": 5},
+}
+
+# 대기 시간 히스토그램 구간 (초)
+QUEUE_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0)
+
+
+def worker_count() -> int:
+    """워커 수 (gunicorn_conf.py에서 실제 워커 수로 설정). 버킷은 워커별이므로 한도를 워커 수로 나눔"""
+    return max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+
+
+class Overloaded(Exception):
+    """대기열 초과 또는 대기 시간 초과로 요청을 거절할 때"""
+
+
+class TokenBucketLimiter:
+    """사용자별 토큰 버킷 (워커 프로세스 로컬)"""
+
+    def __init__(self, rate: float = RATE_LIMIT_RATE, burst: float = RATE_LIMIT_BURST, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def consume(self, key: str, cost: float) -> float:
+        """토큰 소모 시도. 허용되면 0, 거절되면 재시도까지 남은 시간(초) 반환"""
+        if cost <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [self.burst, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return 0.0
+        return (cost - bucket[0]) / self.rate
+
+
+class RouteStats:
+    """경로별 수용 통계"""
+
+    def __init__(self):
+        self.admitted = 0
+        self.rate_limited = 0
+        self.shed = 0
+        self.queue_time_count = 0
+        self.queue_time_sum = 0.0
+        self.queue_time_max = 0.0
+        self.queue_time_buckets = [0] * (len(QUEUE_TIME_BUCKETS) + 1)
+
+    def observe_queue_time(self, seconds: float):
+        self.queue_time_count += 1
+        self.queue_time_sum += seconds
+        self.queue_time_max = max(self.queue_time_max, seconds)
+        self.queue_time_buckets[bisect.bisect_left(QUEUE_TIME_BUCKETS, seconds)] += 1
+
+    def merge(self, data: Dict[str, Any]):
+        """다른 워커의 to_dict() 결과 합산"""
+        self.admitted += data["admitted"]
+        self.rate_limited += data["rate_limited"]
+        self.shed += data["shed"]
+        queue_time = data["queue_time"]
+        self.queue_time_count += queue_time["count"]
+        self.queue_time_sum += queue_time["sum"]
+        self.queue_time_max = max(self.queue_time_max, queue_time["max"])
+        for i, count in enumerate(queue_time["buckets"].values()):
+            self.queue_time_buckets[i] += count
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [str(b) for b in QUEUE_TIME_BUCKETS] + ["+Inf"]
+        return {
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "shed": self.shed,
+            "queue_time": {
+                "count": self.queue_time_count,
+                "sum": round(self.queue_time_sum, 6),
+                "max": round(self.queue_time_max, 6),
+                "avg": round(self.queue_time_sum / self.queue_time_count, 6) if self.queue_time_count else 0.0,
+                "buckets": dict(zip(labels, self.queue_time_buckets))
+            }
+        }
+
+
+class AdmissionController:
+    """우선순위 대기열 기반 동시 처리 제한
+
+    - 전체 동시 처리 수는 max_inflight로 제한하고, 그중 reserved 슬롯은 CRITICAL 전용
+    - 경로별 max_concurrency로 비싼 요청의 동시 처리 수 제한
+    - 대기열이 가득 차면 가장 낮은 우선순위의 대기 요청부터 거절
+    """
+
+    def __init__(self, max_inflight: int = MAX_INFLIGHT, reserved: int = RESERVED_CRITICAL,
+                 max_queue: int = MAX_QUEUE, policies: Optional[Dict[str, Dict[str, Any]]] = None,
+                 workers: Optional[int] = None):
+        self.max_inflight = max_inflight
+        self.reserved = min(reserved, max_inflight - 1)
+        self.max_queue = max_queue
+        self.policies = ROUTE_POLICIES if policies is None else policies
+        # None이면 첫 요청 시점(fork 이후)의 워커 수 사용 (preload_app으로 마스터에서 생성되므로)
+        self.workers = workers
+        self._limiter: Optional[TokenBucketLimiter] = None
+
+        self.inflight = 0
+        self.route_inflight: Dict[str, int] = {}
+        # (priority, seq, route, future) 정렬 리스트
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self.stats: Dict[str, RouteStats] = {}
+
+    @property
+    def limiter(self) -> TokenBucketLimiter:
+        if self._limiter is None:
+            workers = self.workers or worker_count()
+            # 워커별 몫 (가장 비싼 요청 한 번은 항상 가능하도록 burst 하한 유지)
+            max_cost = max([policy["cost"] for policy in self.policies.values()] + [DEFAULT_POLICY["cost"]])
+            self._limiter = TokenBucketLimiter(
+                rate=RATE_LIMIT_RATE / workers,
+                burst=max(RATE_LIMIT_BURST / workers, max_cost)
+            )
+        return self._limiter
+
+    def route_key(self, path: str) -> str:
+        """집계용 경로 키 (등록되지 않은 경로는 하나로 묶어 dict가 커지지 않도록)"""
+        return path if path in self.policies else OTHER_ROUTE
+
+    def policy_for(self, route: str) -> Dict[str, Any]:
+        return self.policies.get(route, DEFAULT_POLICY)
+
+    def route_stats(self, route: str) -> RouteStats:
+        stats = self.stats.get(route)
+        if stats is None:
+            stats = self.stats[route] = RouteStats()
+        return stats
+
+    def _can_run(self, route: str, priority: int) -> bool:
+        limit = self.max_inflight if priority == Priority.CRITICAL else self.max_inflight - self.reserved
+        if self.inflight >= limit:
+            return False
+        max_concurrency = self.policy_for(route)["max_concurrency"]
+        if max_concurrency is not None and self.route_inflight.get(route, 0) >= max_concurrency:
+            return False
+        return True
+
+    def _runnable_waiter_ahead(self, priority: int) -> bool:
+        """같거나 높은 우선순위 대기 요청 중 지금 처리 가능한 것이 있는지
+
+        경로별 동시 처리 제한에 막힌 대기 요청은 다른 경로의 요청을 막지 않음
+        """
+        for waiter_priority, _, route, future in self._waiters:
+            if waiter_priority > priority:
+                break
+            if not future.done() and self._can_run(route, waiter_priority):
+                return True
+        return False
+
+    def _take(self, route: str):
+        self.inflight += 1
+        self.route_inflight[route] = self.route_inflight.get(route, 0) + 1
+
+    def _remove_waiter(self, waiter: tuple):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    async def acquire(self, route: str) -> float:
+        """처리 슬롯 확보. 대기한 시간(초)을 반환하고, 거절 시 Overloaded 발생"""
+        policy = self.policy_for(route)
+        priority = policy["priority"]
+
+        # 앞선 대기 요청이 처리 가능하지 않으면 바로 처리
+        if self._can_run(route, priority) and not self._runnable_waiter_ahead(priority):
+            self._take(route)
+            return 0.0
+
+        if len(self._waiters) >= self.max_queue:
+            lowest = self._waiters[-1]
+            if lowest[0] <= priority:
+                raise Overloaded("Server is busy")
+            # 가장 낮은 우선순위 대기 요청을 밀어냄
+            self._waiters.pop()
+            if not lowest[3].done():
+                lowest[3].set_exception(Overloaded("Shed by higher priority request"))
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        waiter = (priority, next(self._seq), route, future)
+        bisect.insort(self._waiters, waiter)
+        try:
+            # wait_for와 달리 호출 측 취소를 삼키지 않음
+            done, _ = await asyncio.wait((future,), timeout=policy["max_wait"])
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if not done:
+            self._abandon(waiter)
+            raise Overloaded("Queue wait timed out")
+        # 밀려난 경우 Overloaded 발생
+        future.result()
+        return time.monotonic() - started
+
+    def _abandon(self, waiter: tuple):
+        """대기를 포기한 요청 정리 (그 사이 슬롯을 받았다면 반납)"""
+        self._remove_waiter(waiter)
+        future = waiter[3]
+        if not future.done():
+            future.cancel()
+        elif not future.cancelled() and future.exception() is None:
+            self.release(waiter[2])
+
+    def release(self, route: str):
+        self.inflight -= 1
+        self.route_inflight[route] -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """빈 슬롯을 우선순위 순으로 대기 요청에 배정"""
+        i = 0
+        while i < len(self._waiters) and self.inflight < self.max_inflight:
+            priority, _, route, future = self._waiters[i]
+            if future.done():
+                del self._waiters[i]
+                continue
+            if self._can_run(route, priority):
+                del self._waiters[i]
+                self._take(route)
+                future.set_result(None)
+                continue
+            i += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "inflight": self.inflight,
+            "queued": len(self._waiters),
+            "max_inflight": self.max_inflight,
+            "reserved_critical": self.reserved,
+            "routes": {route: stats.to_dict() for route, stats in self.stats.items()}
+        }
+
+    def write_snapshot(self, directory: str = METRICS_DIR):
+        """이 워커의 지표를 파일로 저장 (다른 워커가 합산할 수 있도록)"""
+        path = os.path.join(directory, f"admission-{os.getpid()}.json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"pid": os.getpid(), "written_at": time.time(), **self.metrics()}, f)
+        os.replace(tmp_path, path)
+
+    def remove_snapshot(self, directory: str = METRICS_DIR):
+        """이 워커의 지표 파일 삭제 (워커 종료 시)"""
+        try:
+            os.remove(os.path.join(directory, f"admission-{os.getpid()}.json"))
+        except FileNotFoundError:
+            pass
+
+    async def export_snapshots(self, directory: str = METRICS_DIR, interval: float = METRICS_INTERVAL):
+        """주기적으로 지표 스냅샷 저장 (워커 startup에서 백그라운드 태스크로 실행)"""
+        while True:
+            try:
+                self.write_snapshot(directory)
+            except OSError as e:
+                logger.warning("수용 제어 지표 저장 실패: %s", e)
+            await asyncio.sleep(interval)
+
+
+def read_snapshots(directory: str = METRICS_DIR, max_age: float = METRICS_INTERVAL * 3) -> list:
+    """최근에 저장된 워커별 지표 스냅샷 (종료된 워커의 오래된 파일은 제외)"""
+    snapshots = []
+    now = time.time()
+    for name in os.listdir(directory):
+        if not (name.startswith("admission-") and name.endswith(".json")):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if now - snapshot.get("written_at", 0) <= max_age:
+            snapshots.append(snapshot)
+    return snapshots
+
+
+def merge_metrics(snapshots: list) -> Dict[str, Any]:
+    """워커별 지표 합산 (카운터와 히스토그램은 합, 최대값은 max)"""
+    routes: Dict[str, RouteStats] = {}
+    for snapshot in snapshots:
+        for route, data in snapshot["routes"].items():
+            routes.setdefault(route, RouteStats()).merge(data)
+    return {
+        "workers": sorted(snapshot["pid"] for snapshot in snapshots),
+        "inflight": sum(snapshot["inflight"] for snapshot in snapshots),
+        "queued": sum(snapshot["queued"] for snapshot in snapshots),
+        "max_inflight": sum(snapshot["max_inflight"] for snapshot in snapshots),
+        "reserved_critical": sum(snapshot["reserved_critical"] for snapshot in snapshots),
+        "routes": {route: stats.to_dict() for route, stats in routes.items()}
+    }
+
+
+def aggregated_metrics(controller: AdmissionController, directory: str = METRICS_DIR) -> Dict[str, Any]:
+    """모든 워커의 지표 합산 (디렉터리 미설정 시 현재 워커만)"""
+    if not directory:
+        return merge_metrics([{"pid": os.getpid(), **controller.metrics()}])
+    # 응답하는 워커의 지표는 최신 값으로 갱신 후 합산
+    controller.write_snapshot(directory)
+    return merge_metrics(read_snapshots(directory))
+
+
+class AdmissionMiddleware:
+    """요청 수용 제어 ASGI 미들웨어 (사용자별 속도 제한 + 우선순위 대기열)"""
+
+    def __init__(self, app, controller: AdmissionController, resolve_principal: Callable[[str], Optional[str]]):
+        self.app = app
+        self.controller = controller
+        # Bearer 토큰 -> 사용자 식별자 (verify_token과 같은 기준)
+        self.resolve_principal = resolve_principal
+
+    def _principal(self, scope) -> str:
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    principal = self.resolve_principal(token.strip())
+                    if principal:
+                        return f"user:{principal}"
+                break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        route = self.controller.route_key(scope["path"])
+        policy = self.controller.policy_for(route)
+        stats = self.controller.route_stats(route)
+
+        # 우선순위별로 버킷을 나눠 비싼 요청이 안전 관련 요청의 한도를 소모하지 않도록
+        # (RATE_LIMIT_RATE / RATE_LIMIT_BURST는 등급별 한도)
+        bucket_key = f"{self._principal(scope)}:{policy['priority'].name}"
+        retry_after = self.controller.limiter.consume(bucket_key, policy["cost"])
+        if retry_after > 0:
+            stats.rate_limited += 1
+            response = JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            queue_time = await self.controller.acquire(route)
+        except Overloaded as e:
+            stats.shed += 1
+            response = JSONResponse({"detail": str(e)}, status_code=503, headers={"Retry-After": "1"})
+            await response(scope, receive, send)
+            return
+
+        stats.admitted += 1
+        stats.observe_queue_time(queue_time)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", f"queue;dur={queue_time * 1000:.1f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            self.controller.release(route)
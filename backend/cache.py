@@ -0,0 +1,107 @@
+# backend/cache.py
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 공유 캐시 주소 (예: redis://localhost:6379/0, 없으면 프로세스 로컬 캐시 사용)
+CACHE_URL = os.getenv("CACHE_URL", "")
+# Redis 응답 대기 시간 (초, 장애 시 요청이 오래 묶이지 않도록 짧게)
+CACHE_TIMEOUT = float(os.getenv("CACHE_TIMEOUT", "0.2"))
+
+
+class CacheBackend:
+    """캐시 백엔드 인터페이스 (값은 JSON 직렬화 가능해야 함)
+
+    캐시 장애는 요청 실패로 이어지지 않도록 get은 None(미스), set/delete는 무시로 처리
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+
+class LocalCache(CacheBackend):
+    """프로세스 로컬 캐시 (단일 워커 / 개발용, 이벤트 루프 안에서만 사용)"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        if key not in self._data and len(self._data) >= self.max_entries:
+            # 가장 오래된 항목 제거
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (value, expires_at)
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+
+class RedisCache(CacheBackend):
+    """Redis 공유 캐시 (워커 간 공유, 비동기 클라이언트)"""
+
+    def __init__(self, url: str, prefix: str = "sinkhole:"):
+        import redis.asyncio  # 선택 의존성
+        self.client = redis.asyncio.Redis.from_url(
+            url, socket_timeout=CACHE_TIMEOUT, socket_connect_timeout=CACHE_TIMEOUT
+        )
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self.client.get(self.prefix + key)
+            return json.loads(raw) if raw is not None else None
+        except Exception as e:
+            logger.warning("캐시 조회 실패 (%s): %s", key, e)
+            return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        try:
+            await self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+        except Exception as e:
+            logger.warning("캐시 저장 실패 (%s): %s", key, e)
+
+    async def delete(self, key: str):
+        try:
+            await self.client.delete(self.prefix + key)
+        except Exception as e:
+            logger.warning("캐시 삭제 실패 (%s): %s", key, e)
+
+
+_caches: Dict[str, CacheBackend] = {}
+
+
+def get_cache(name: str = "default") -> CacheBackend:
+    """이름별 캐시 인스턴스 (워커마다 fork 이후 최초 호출 시 생성)"""
+    cache = _caches.get(name)
+    if cache is None:
+        if CACHE_URL.startswith(("redis://", "rediss://")):
+            try:
+                cache = RedisCache(CACHE_URL, prefix=f"sinkhole:{name}:")
+            except ImportError:
+                logger.warning("redis 패키지가 없어 로컬 캐시를 사용합니다.")
+                cache = LocalCache()
+        else:
+            cache = LocalCache()
+        _caches[name] = cache
+    return cache
@@ -22,6 +22,13 @@ def get_db():
     finally:
         db.close()
 
+def init_db():
+    """테이블 생성 (앱 시작 시 한 번 호출)"""
+    import models  # noqa: F401 - 테이블 메타데이터 등록
+    Base.metadata.create_all(bind=engine)
+    # fork 전에 연 커넥션이 워커 간 공유되지 않도록 풀 정리
+    engine.dispose()
+
 # backend/models.py
 from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey
 from sqlalchemy.orm import relationship
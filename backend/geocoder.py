@@ -0,0 +1,338 @@
+# backend/geocoder.py
+import csv
+import logging
+import math
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+from utils import calculate_distance
+
+logger = logging.getLogger(__name__)
+
+# 로컬 주소 데이터셋 경로 (CSV: name,latitude,longitude[,address])
+GEOCODE_DATA_PATH = os.getenv("GEOCODE_DATA_PATH", "./data/seoul_addresses.csv")
+
+# 데이터셋이 없을 때 사용하는 기본 주소 목록
+DEFAULT_ADDRESSES = [
+    {"name": "서울시청", "lat": 37.5665, "lng": 126.9780},
+    {"name": "강남역", "lat": 37.4979, "lng": 127.0276},
+    {"name": "홍대입구역", "lat": 37.5563, "lng": 126.9236},
+    {"name": "종로", "lat": 37.5694, "lng": 126.9769},
+]
+
+# 주소 앞에 붙는 시 이름 (n-gram 생성 시 제거)
+CITY_PREFIXES = ("서울특별시", "서울시", "서울")
+
+# 퍼지 매칭 최소 점수 (Dice 계수)
+FUZZY_THRESHOLD = 0.5
+# 이보다 흔한 n-gram은 역색인 대신 비트맵으로 저장하고, 후보별 포함 여부만 확인
+MAX_POSTINGS = 5000
+
+# 역지오코딩 격자 크기 (도 단위, 약 110m x 90m)
+GRID_SIZE = 0.001
+# 격자 번호 = 행 * _GRID_COLS + 열 (같은 행의 셀은 번호가 연속)
+_GRID_COLS = 1 << 20
+
+# 위도 1도당 거리 (미터, calculate_distance와 같은 지구 반지름 기준)
+_METERS_PER_DEGREE = 6371000 * math.pi / 180
+
+
+def normalize_address(address: str) -> str:
+    """주소 정규화 (공백 제거, 소문자 변환)"""
+    return "".join(address.split()).lower()
+
+
+def _strip_city(text: str) -> str:
+    for prefix in CITY_PREFIXES:
+        if text.startswith(prefix) and len(text) - len(prefix) >= 2:
+            return text[len(prefix):]
+    return text
+
+
+def _bigrams(text: str) -> set:
+    text = _strip_city(text)
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class Geocoder:
+    """주소 검색 인덱스 (정렬 배열 + n-gram 역색인 + 격자 공간 색인)
+
+    항목별 파이썬 객체를 만들지 않도록 정렬된 리스트와 array로 구성
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.names: List[str] = []
+        # 데이터셋에 주소가 없으면 None (조회 시 이름으로 생성)
+        self.addresses: List[Optional[str]] = []
+        self.lats = array("d")
+        self.lngs = array("d")
+        ngram_counts = array("H")
+
+        keyed: List[tuple] = []
+        postings: Dict[str, List[int]] = {}
+        cells: List[tuple] = []
+
+        for entry in entries:
+            key = normalize_address(entry["name"])
+            if not key:
+                continue
+
+            idx = len(self.names)
+            self.names.append(entry["name"])
+            self.addresses.append(entry.get("address"))
+            self.lats.append(float(entry["lat"]))
+            self.lngs.append(float(entry["lng"]))
+            keyed.append((key, idx))
+
+            grams = _bigrams(key)
+            ngram_counts.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                postings.setdefault(gram, []).append(idx)
+
+            cells.append((self._cell_id(self.lats[idx], self.lngs[idx]), idx))
+
+        # 정렬된 이름 배열 (같은 이름은 먼저 등록된 항목 유지)
+        keyed.sort()
+        self.keys: List[str] = []
+        self.key_ids = array("I")
+        for key, idx in keyed:
+            if self.keys and self.keys[-1] == key:
+                continue
+            self.keys.append(key)
+            self.key_ids.append(idx)
+
+        # n-gram 역색인 (항목 번호 오름차순 정렬 배열), 흔한 n-gram은 항목별 비트맵
+        self.ngram_index: Dict[str, np.ndarray] = {}
+        self.ngram_bitmaps: Dict[str, np.ndarray] = {}
+        for gram, ids in postings.items():
+            if len(ids) <= MAX_POSTINGS:
+                self.ngram_index[gram] = np.array(ids, dtype=np.uint32)
+            else:
+                bits = np.zeros(len(self.names), dtype=bool)
+                bits[ids] = True
+                self.ngram_bitmaps[gram] = np.packbits(bits)
+        self.ngram_counts = np.frombuffer(ngram_counts, dtype=np.uint16)
+
+        # 격자 번호 순으로 정렬한 항목 배열
+        cells.sort()
+        self.cell_ids = array("q", (cell for cell, _ in cells))
+        self.cell_entries = array("I", (idx for _, idx in cells))
+
+    @staticmethod
+    def _cell(lat: float, lng: float) -> tuple:
+        return (math.floor(lat / GRID_SIZE), math.floor(lng / GRID_SIZE))
+
+    @classmethod
+    def _cell_id(cls, lat: float, lng: float) -> int:
+        row, col = cls._cell(lat, lng)
+        return row * _GRID_COLS + col + _GRID_COLS // 2
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _formatted_address(self, idx: int) -> str:
+        address = self.addresses[idx]
+        if address:
+            return address
+        name = self.names[idx]
+        # 이름이 이미 시 이름으로 시작하면 그대로 사용
+        words = name.split()
+        if words and words[0] in CITY_PREFIXES:
+            return name
+        return f"서울특별시 {name}"
+
+    def _result(self, idx: int, score: float = 1.0) -> Dict[str, Any]:
+        return {
+            "latitude": self.lats[idx],
+            "longitude": self.lngs[idx],
+            "formatted_address": self._formatted_address(idx),
+            "name": self.names[idx],
+            "score": round(score, 3),
+            "success": True
+        }
+
+    def _contained_match(self, key: str, word_starts: List[int]) -> Optional[tuple]:
+        """주소 안에 포함된 가장 긴 등록 이름 찾기 (단어 시작 위치에서만)
+
+        반환값: (항목 번호, 일치한 길이)
+        """
+        keys = self.keys
+        best = None
+        for start in word_starts:
+            lo = 0
+            for end in range(start + 1, len(key) + 1):
+                part = key[start:end]
+                # part로 시작하는 이름은 정렬 배열에서 lo부터 연속
+                lo = bisect_left(keys, part, lo)
+                if lo == len(keys) or not keys[lo].startswith(part):
+                    break
+                if keys[lo] == part and (best is None or end - start > best[1]):
+                    best = (self.key_ids[lo], end - start)
+        return best
+
+    def _fuzzy_match(self, key: str) -> Optional[tuple]:
+        """n-gram 유사도(Dice 계수) 기반 퍼지 매칭
+
+        드문 n-gram의 역색인으로 후보를 만들고, 흔한 n-gram은 비트맵으로 후보별
+        포함 여부를 확인해 정확한 공통 n-gram 수로 점수 계산
+        """
+        grams = _bigrams(key)
+        rare = [self.ngram_index[g] for g in grams if g in self.ngram_index]
+        common = [self.ngram_bitmaps[g] for g in grams if g in self.ngram_bitmaps]
+
+        if rare:
+            candidates, shared = np.unique(np.concatenate(rare), return_counts=True)
+        elif common:
+            # 흔한 n-gram뿐이면 그중 하나의 항목 전체가 후보
+            candidates = np.flatnonzero(np.unpackbits(common.pop(), count=len(self.names))).astype(np.uint32)
+            shared = np.ones(len(candidates), dtype=np.int64)
+        else:
+            return None
+
+        byte_index = candidates >> 3
+        bit_shift = 7 - (candidates & 7)
+        for bitmap in common:
+            shared += (bitmap[byte_index] >> bit_shift) & 1
+
+        scores = 2 * shared / (len(grams) + self.ngram_counts[candidates])
+        best = int(np.argmax(scores))
+        if scores[best] >= FUZZY_THRESHOLD:
+            return int(candidates[best]), float(scores[best])
+        return None
+
+    def geocode(self, address: str) -> Optional[Dict[str, Any]]:
+        """주소를 좌표로 변환 (포함 매칭과 퍼지 매칭 중 점수가 높은 쪽)"""
+        words = address.lower().split()
+        key = "".join(words)
+        if not key:
+            return None
+
+        word_starts = []
+        position = 0
+        for word in words:
+            word_starts.append(position)
+            position += len(word)
+
+        best = None
+        contained = self._contained_match(key, word_starts)
+        if contained is not None:
+            # 질의(시 이름 제외) 중 등록 이름이 차지하는 비율
+            idx, length = contained
+            best = (idx, min(1.0, length / len(_strip_city(key))))
+
+        fuzzy = self._fuzzy_match(key)
+        if fuzzy is not None and (best is None or fuzzy[1] > best[1]):
+            best = fuzzy
+
+        if best is None:
+            return None
+        return self._result(*best)
+
+    def _scan_cells(self, row: int, col_from: int, col_to: int):
+        """같은 행에서 col_from~col_to 셀에 속한 항목 번호"""
+        base = row * _GRID_COLS + _GRID_COLS // 2
+        lo = bisect_left(self.cell_ids, base + col_from)
+        hi = bisect_right(self.cell_ids, base + col_to, lo)
+        return self.cell_entries[lo:hi]
+
+    def reverse_geocode(self, latitude: float, longitude: float, max_distance: float = 500) -> Optional[Dict[str, Any]]:
+        """좌표에서 가장 가까운 등록 주소 찾기 (max_distance: 미터)
+
+        현재 셀부터 한 겹씩 넓혀가며 평면 근사 거리로 후보를 고르고,
+        더 바깥 겹이 현재 최단 거리보다 멀어지면 중단
+        """
+        row, col = self._cell(latitude, longitude)
+        lng_scale = _METERS_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01)
+        cell_meters = GRID_SIZE * min(_METERS_PER_DEGREE, lng_scale)
+
+        best_idx, best_sq = None, max_distance * max_distance
+        ring = 0
+        while True:
+            if ring == 0:
+                candidates = [self._scan_cells(row, col, col)]
+            else:
+                candidates = [
+                    self._scan_cells(row - ring, col - ring, col + ring),
+                    self._scan_cells(row + ring, col - ring, col + ring)
+                ]
+                for r in range(row - ring + 1, row + ring):
+                    candidates.append(self._scan_cells(r, col - ring, col - ring))
+                    candidates.append(self._scan_cells(r, col + ring, col + ring))
+
+            for ids in candidates:
+                for idx in ids:
+                    dy = (self.lats[idx] - latitude) * _METERS_PER_DEGREE
+                    dx = (self.lngs[idx] - longitude) * lng_scale
+                    dist_sq = dx * dx + dy * dy
+                    if dist_sq <= best_sq:
+                        best_idx, best_sq = idx, dist_sq
+
+            # 다음 겹의 모든 점은 최소 ring * cell_meters 만큼 떨어져 있음
+            reach = ring * cell_meters
+            if reach * reach >= best_sq or reach > max_distance:
+                break
+            ring += 1
+
+        if best_idx is None:
+            return None
+        distance = calculate_distance(latitude, longitude, self.lats[best_idx], self.lngs[best_idx])
+        if distance > max_distance:
+            return None
+        result = self._result(best_idx)
+        result["distance"] = distance
+        return result
+
+
+def load_address_entries(path: str = GEOCODE_DATA_PATH) -> List[Dict[str, Any]]:
+    """로컬 주소 데이터셋 로드 (없으면 기본 목록 사용)"""
+    if not os.path.exists(path):
+        return list(DEFAULT_ADDRESSES)
+
+    entries = []
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                try:
+                    entries.append({
+                        "name": row["name"].strip(),
+                        "lat": float(row["latitude"]),
+                        "lng": float(row["longitude"]),
+                        "address": (row.get("address") or "").strip() or None
+                    })
+                except (KeyError, TypeError, ValueError):
+                    continue
+    except OSError as e:
+        logger.warning("주소 데이터 로드 실패: %s", e)
+        return list(DEFAULT_ADDRESSES)
+
+    return entries or list(DEFAULT_ADDRESSES)
+
+
+_geocoder: Optional[Geocoder] = None
+
+
+def get_geocoder() -> Geocoder:
+    """전역 Geocoder 인스턴스 (최초 호출 시 로드)"""
+    global _geocoder
+    if _geocoder is None:
+        _geocoder = Geocoder(load_address_entries())
+    return _geocoder
+
+
+@lru_cache(maxsize=4096)
+def cached_geocode(address: str) -> Optional[Dict[str, Any]]:
+    return get_geocoder().geocode(address)
+
+
+def reload_geocoder():
+    """데이터셋 다시 로드 및 캐시 초기화"""
+    global _geocoder
+    _geocoder = None
+    cached_geocode.cache_clear()
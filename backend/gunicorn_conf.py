@@ -0,0 +1,75 @@
+# backend/gunicorn_conf.py
+# 운영 실행: gunicorn -c gunicorn_conf.py main:app
+import gc
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+_started_at = time.perf_counter()
+
+# 테이블 생성은 마스터 프로세스에서 한 번만 수행 (워커 startup에서는 건너뜀)
+os.environ["DB_INIT_ON_STARTUP"] = "0"
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+# 워커별 지표 스냅샷 공유 디렉터리 (/api/metrics/admission에서 합산, 직접 만든 경우 종료 시 삭제)
+_metrics_dir_created = None
+if not os.getenv("ADMISSION_METRICS_DIR"):
+    _metrics_dir_created = tempfile.mkdtemp(prefix="sinkhole-admission-")
+    os.environ["ADMISSION_METRICS_DIR"] = _metrics_dir_created
+
+# fork 전에 앱과 읽기 전용 데이터를 로드하여 워커 간 copy-on-write로 공유
+preload_app = True
+
+
+def _memory_usage() -> dict:
+    """현재 프로세스 메모리 사용량 (KB)"""
+    usage = {"max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+    try:
+        # Linux: 공유/전용 메모리 구분
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if parts[0] in ("Rss:", "Pss:", "Shared_Clean:", "Private_Dirty:"):
+                    usage[parts[0].rstrip(":").lower()] = int(parts[1])
+    except (OSError, IndexError, ValueError):
+        pass
+    return usage
+
+
+def on_starting(server):
+    from database import init_db
+    from warmup import warm_shared_data
+
+    # 수용 제어(admission.py)의 토큰 버킷은 워커별로 따로 관리되므로,
+    # 실제 워커 수(-w 옵션 반영)를 알려 RATE_LIMIT_RATE / RATE_LIMIT_BURST(사용자·우선순위 등급별 한도)를 워커 수로 나눠 적용.
+    # 연결이 워커에 고르게 분산되지 않거나 TTIN/TTOU로 워커 수를 바꾸면 실제 한도는 달라질 수 있음
+    os.environ["WEB_CONCURRENCY"] = str(server.cfg.workers)
+
+    init_db()
+    elapsed = warm_shared_data()
+    server.log.info(f"공유 데이터 로드 {elapsed:.2f}s")
+
+    # 이후 GC가 공유 객체를 건드려 페이지가 복사되지 않도록 고정
+    gc.freeze()
+
+
+def when_ready(server):
+    elapsed = time.perf_counter() - _started_at
+    server.log.info(f"콜드 스타트 {elapsed:.2f}s, 마스터 메모리 {_memory_usage()}")
+
+
+def post_worker_init(worker):
+    worker.log.info(f"워커 {worker.pid} 시작, 메모리 {_memory_usage()}")
+
+
+def on_exit(server):
+    if _metrics_dir_created:
+        shutil.rmtree(_metrics_dir_created, ignore_errors=True)
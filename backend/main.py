@@ -11,20 +11,19 @@ import uuid
 from datetime import datetime, timedelta
 import jwt
 import hashlib
-import httpx
 import asyncio
 from io import BytesIO
 import base64
+from functools import lru_cache
 
 # 로컬 모듈 임포트
-from database import get_db, engine, Base
+from database import get_db, init_db
 from models import User, SinkholeReport, LocationSearch
 from schemas import UserCreate, UserLogin, LocationRequest, RouteRequest, VoiceQuery, ImageAnalysis
 from azure_services import AzureOpenAI, AzureSpeech, AzureCustomVision
-from utils import get_current_location, calculate_safe_route, validate_coordinates
-
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
+from utils import get_current_location, calculate_safe_route, validate_coordinates, fetch_risk_assessment
+from warmup import warm_shared_data
+from admission import AdmissionController, AdmissionMiddleware, aggregated_metrics, METRICS_DIR
 
 app = FastAPI(
     title="Sinkhole Prediction Service",
@@ -32,28 +31,52 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# CORS 설정
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:3001"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
 # 보안 설정
 security = HTTPBearer()
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this")
 ALGORITHM = "HS256"
 
-# Azure 서비스 인스턴스
-azure_openai = AzureOpenAI()
-azure_speech = AzureSpeech()
-azure_vision = AzureCustomVision()
+# Azure 서비스 인스턴스 (워커 프로세스별로 최초 사용 시 생성)
+@lru_cache(maxsize=None)
+def get_azure_openai() -> AzureOpenAI:
+    return AzureOpenAI()
+
+@lru_cache(maxsize=None)
+def get_azure_speech() -> AzureSpeech:
+    return AzureSpeech()
+
+@lru_cache(maxsize=None)
+def get_azure_vision() -> AzureCustomVision:
+    return AzureCustomVision()
 
 # 임시 ML 모델 엔드포인트 (나중에 실제 모델로 교체)
 ML_MODEL_ENDPOINT = "http://localhost:8001/predict"
 
+# 위험도 격자 캐시 (약 100m 단위, 초)
+RISK_CACHE_TTL = int(os.getenv("RISK_CACHE_TTL", "300"))
+
+@app.on_event("startup")
+async def on_startup():
+    # gunicorn 실행 시에는 마스터에서 이미 처리됨 (gunicorn_conf.py)
+    if os.getenv("DB_INIT_ON_STARTUP", "1") == "1":
+        init_db()
+    warm_shared_data()
+    # 워커별 수용 제어 지표를 공유 디렉터리에 주기적으로 저장
+    if METRICS_DIR:
+        app.state.metrics_task = asyncio.create_task(admission_controller.export_snapshots())
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # 지표 저장 태스크 중지 및 종료된 워커의 스냅샷 삭제 (합산에서 바로 제외되도록)
+    metrics_task = getattr(app.state, "metrics_task", None)
+    if metrics_task is not None:
+        metrics_task.cancel()
+        try:
+            await metrics_task
+        except asyncio.CancelledError:
+            pass
+        admission_controller.remove_snapshot()
+
 # 인증 헬퍼 함수
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -62,15 +85,35 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def decode_token(token: str) -> Optional[str]:
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return username
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return payload.get("sub")
     except jwt.PyJWTError:
+        return None
+
+def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    username = decode_token(credentials.credentials)
+    if username is None:
         raise HTTPException(status_code=401, detail="Invalid token")
+    return username
+
+# 요청 수용 제어 (사용자별 속도 제한, 경로별 동시 처리 제한, 우선순위 대기열)
+admission_controller = AdmissionController()
+app.add_middleware(
+    AdmissionMiddleware,
+    controller=admission_controller,
+    resolve_principal=decode_token
+)
+
+# CORS 설정 (수용 제어보다 나중에 추가해야 429/503 응답에도 CORS 헤더가 붙음)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:3000", "http://localhost:3001"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
 
 # 회원가입 및 로그인 엔드포인트
 @app.post("/api/auth/register")
@@ -149,38 +192,14 @@ async def get_location_risk(
         if not validate_coordinates(location.latitude, location.longitude):
             raise HTTPException(status_code=400, detail="Invalid coordinates")
         
-        # ML 모델 API 호출 (임시로 더미 데이터 반환)
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    ML_MODEL_ENDPOINT,
-                    json={
-                        "latitude": location.latitude,
-                        "longitude": location.longitude,
-                        "radius": location.radius or 1000
-                    },
-                    timeout=10
-                )
-                risk_data = response.json()
-            except httpx.RequestError:
-                # ML 모델 서버가 없을 때 더미 데이터
-                risk_data = {
-                    "risk_level": "medium",
-                    "probability": 0.35,
-                    "factors": [
-                        "Old water pipes in area",
-                        "High rainfall last month",
-                        "Subway construction nearby"
-                    ],
-                    "nearby_risks": [
-                        {
-                            "latitude": location.latitude + 0.001,
-                            "longitude": location.longitude + 0.001,
-                            "risk_level": "high",
-                            "probability": 0.78
-                        }
-                    ]
-                }
+        # ML 모델 API 호출 (위험도 격자 캐시, 서버가 없으면 더미 데이터)
+        risk_data = await fetch_risk_assessment(
+            location.latitude,
+            location.longitude,
+            location.radius or 1000,
+            ML_MODEL_ENDPOINT,
+            RISK_CACHE_TTL
+        )
         
         # 검색 기록 저장
         search_record = LocationSearch(
@@ -248,13 +267,13 @@ async def voice_query(
     try:
         # 음성 파일을 텍스트로 변환 (Azure Speech)
         audio_content = await audio_file.read()
-        text_query = await azure_speech.speech_to_text(audio_content)
+        text_query = await get_azure_speech().speech_to_text(audio_content)
         
         # OpenAI로 질의 처리
-        ai_response = await azure_openai.process_sinkhole_query(text_query)
+        ai_response = await get_azure_openai().process_sinkhole_query(text_query)
         
         # 텍스트를 음성으로 변환
-        audio_response = await azure_speech.text_to_speech(ai_response)
+        audio_response = await get_azure_speech().text_to_speech(ai_response)
         
         return {
             "query": text_query,
@@ -282,7 +301,7 @@ async def analyze_sinkhole_image(
         image_content = await image.read()
         
         # Azure Custom Vision으로 분석
-        analysis_result = await azure_vision.analyze_sinkhole_image(image_content)
+        analysis_result = await get_azure_vision().analyze_sinkhole_image(image_content)
         
         response_data = {
             "is_sinkhole": analysis_result["is_sinkhole"],
@@ -293,7 +312,7 @@ async def analyze_sinkhole_image(
         
         # 싱크홀로 판단되면 신고 방법 안내
         if analysis_result["is_sinkhole"] and analysis_result["confidence"] > 0.7:
-            reporting_info = await azure_openai.get_sinkhole_reporting_guide()
+            reporting_info = await get_azure_openai().get_sinkhole_reporting_guide()
             response_data["reporting_guide"] = reporting_info
             
             # 싱크홀 신고 기록 저장
@@ -364,6 +383,14 @@ async def get_user_dashboard(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Dashboard data failed: {str(e)}")
 
+# 요청 수용 제어 지표 (모든 워커 합산 대기 시간, 거절 수)
+@app.get("/api/metrics/admission")
+async def get_admission_metrics(current_user: str = Depends(verify_token)):
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        **aggregated_metrics(admission_controller)
+    }
+
 # 헬스체크
 @app.get("/api/health")
 async def health_check():
@@ -374,5 +401,6 @@ async def health_check():
     }
 
 if __name__ == "__main__":
+    # 개발용 단일 프로세스 실행 (운영: gunicorn -c gunicorn_conf.py main:app)
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,101 @@
+# backend/tests/bench_geocoder.py
+# 지오코더 성능 측정: python tests/bench_geocoder.py [항목 수]
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SEOUL_GU = (
+    "종로구", "중구", "용산구", "성동구", "광진구", "동대문구", "중랑구", "성북구", "강북구",
+    "도봉구", "노원구", "은평구", "서대문구", "마포구", "양천구", "강서구", "구로구", "금천구",
+    "영등포구", "동작구", "관악구", "서초구", "강남구", "송파구", "강동구"
+)
+DONG_SYLLABLES = "가나다라마바사아자차카타파하신문수정청원평화성산"
+
+
+def make_seoul_addresses(count: int, seed: int = 1) -> list:
+    """실제와 비슷한 n-gram 빈도의 지번 주소 목록 (구별 동 16개, 번지 1~999[-1~99])
+
+    구 이름 n-gram은 항목 수 / 25, 동 이름 n-gram은 항목 수 / 400 정도의 역색인 길이를 가짐
+    """
+    rng = random.Random(seed)
+    dongs = {}
+    for gu in SEOUL_GU:
+        names = set()
+        while len(names) < 16:
+            names.add(rng.choice(DONG_SYLLABLES) + rng.choice(DONG_SYLLABLES) + "동")
+        dongs[gu] = sorted(names)
+    dongs["도봉구"][0] = "나가동"
+
+    entries = []
+    for _ in range(count):
+        gu = rng.choice(SEOUL_GU)
+        number = str(rng.randint(1, 999))
+        if rng.random() < 0.7:
+            number += f"-{rng.randint(1, 99)}"
+        entries.append({
+            "name": f"서울특별시 {gu} {rng.choice(dongs[gu])} {number}",
+            "lat": 37.45 + rng.random() * 0.25,
+            "lng": 126.8 + rng.random() * 0.4
+        })
+    entries.append({"name": "서울특별시 도봉구 나가동 691-34", "lat": 37.6688, "lng": 127.0471})
+    return entries
+
+
+def main(count: int):
+    from geocoder import Geocoder
+
+    entries = make_seoul_addresses(count)
+    rng = random.Random(2)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    geocoder = Geocoder(entries)
+    traced_build = time.perf_counter() - started
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    Geocoder(entries)
+    build = time.perf_counter() - started
+    print(f"항목 {len(geocoder)}건, 빌드 {build:.2f}s (tracemalloc 사용 시 {traced_build:.2f}s), 색인 {memory / 1e6:.1f} MB")
+
+    # 표기가 조금씩 다른 질의 (시 이름 생략/축약, 번지 접미사, 띄어쓰기 차이)
+    samples = rng.sample(entries, 1000) + [entries[-1]]
+    queries = []
+    for entry in samples:
+        _, gu, dong, number = entry["name"].split()
+        queries.append(rng.choice((
+            f"서울 {gu} {dong} {number}번지",
+            f"{gu} {dong} {number}",
+            f"서울시 {gu}{dong} {number}",
+        )))
+
+    timings = []
+    correct = 0
+    for entry, query in zip(samples, queries):
+        started = time.perf_counter()
+        result = geocoder.geocode(query)
+        timings.append((time.perf_counter() - started) * 1000)
+        correct += result is not None and result["name"] == entry["name"]
+    timings.sort()
+    print(f"정방향 평균 {sum(timings) / len(timings):.3f} ms, p99 {timings[int(len(timings) * 0.99)]:.3f} ms, "
+          f"정답 {correct}/{len(queries)}")
+
+    timings = []
+    for _ in range(1000):
+        lat, lng = 37.45 + rng.random() * 0.25, 126.8 + rng.random() * 0.4
+        started = time.perf_counter()
+        geocoder.reverse_geocode(lat, lng)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(f"역방향 평균 {sum(timings) / len(timings):.3f} ms, p99 {timings[int(len(timings) * 0.99)]:.3f} ms")
+
+    print(geocoder.geocode("서울 도봉구 나가동 691-34번지"))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300000)
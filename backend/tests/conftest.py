@@ -0,0 +1,6 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+# backend 모듈(admission, cache 등)을 최상위 모듈로 임포트
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,265 @@
+# backend/tests/test_admission.py
+import asyncio
+import json
+import logging
+import time
+
+import pytest
+
+import admission
+from admission import AdmissionController, AdmissionMiddleware, Overloaded, Priority
+
+POLICIES = {
+    "/crit": {"priority": Priority.CRITICAL, "max_concurrency": None, "max_wait": 1.0, "cost": 1},
+    "/normal": {"priority": Priority.NORMAL, "max_concurrency": None, "max_wait": 1.0, "cost": 1},
+    "/low-a": {"priority": Priority.LOW, "max_concurrency": 1, "max_wait": 1.0, "cost": 5},
+    "/low-b": {"priority": Priority.LOW, "max_concurrency": 1, "max_wait": 1.0, "cost": 5},
+}
+
+
+def make_controller(**kwargs) -> AdmissionController:
+    kwargs.setdefault("policies", POLICIES)
+    kwargs.setdefault("workers", 1)
+    return AdmissionController(**kwargs)
+
+
+def test_reserved_slots_only_for_critical():
+    async def scenario():
+        controller = make_controller(max_inflight=3, reserved=1, policies={
+            **POLICIES, "/normal": {**POLICIES["/normal"], "max_wait": 0.05}
+        })
+        await controller.acquire("/normal")
+        await controller.acquire("/normal")
+
+        # 남은 한 슬롯은 CRITICAL 전용
+        with pytest.raises(Overloaded):
+            await controller.acquire("/normal")
+        assert await controller.acquire("/crit") == 0.0
+        assert controller.inflight == 3
+
+    asyncio.run(scenario())
+
+
+def test_route_cap_does_not_block_other_routes():
+    async def scenario():
+        controller = make_controller(max_inflight=10, reserved=1)
+        await controller.acquire("/low-a")
+        queued = asyncio.create_task(controller.acquire("/low-a"))
+        await asyncio.sleep(0)
+        assert len(controller._waiters) == 1
+
+        # /low-a 제한에 막힌 대기 요청이 /low-b를 막지 않음
+        assert await controller.acquire("/low-b") == 0.0
+
+        controller.release("/low-a")
+        await queued
+        assert controller.route_inflight == {"/low-a": 1, "/low-b": 1}
+
+    asyncio.run(scenario())
+
+
+def test_lowest_priority_waiter_is_shed_first():
+    async def scenario():
+        controller = make_controller(max_inflight=1, reserved=0, max_queue=2)
+        await controller.acquire("/normal")
+
+        low = asyncio.create_task(controller.acquire("/low-a"))
+        normal = asyncio.create_task(controller.acquire("/normal"))
+        await asyncio.sleep(0)
+
+        # 대기열이 가득 찬 상태에서 CRITICAL이 오면 LOW가 밀려남
+        crit = asyncio.create_task(controller.acquire("/crit"))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded):
+            await low
+
+        # 대기열의 최저 우선순위보다 높지 않은 요청은 바로 거절
+        with pytest.raises(Overloaded):
+            await controller.acquire("/low-b")
+
+        # 빈 슬롯은 우선순위 순으로 배정
+        controller.release("/normal")
+        await crit
+        assert not normal.done()
+        controller.release("/crit")
+        await normal
+        assert controller.inflight == 1
+
+    asyncio.run(scenario())
+
+
+def test_slot_released_when_cancelled_after_grant():
+    async def scenario():
+        controller = make_controller(max_inflight=1, reserved=0)
+        await controller.acquire("/normal")
+        waiter = asyncio.create_task(controller.acquire("/normal"))
+        await asyncio.sleep(0)
+
+        # 슬롯이 배정된 직후, 대기 태스크가 깨어나기 전에 취소
+        controller.release("/normal")
+        assert controller.inflight == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert controller.inflight == 0
+        assert controller.route_inflight == {"/normal": 0}
+
+    asyncio.run(scenario())
+
+
+def test_slot_released_when_timeout_races_grant(monkeypatch):
+    async def scenario():
+        controller = make_controller(max_inflight=1, reserved=0)
+        await controller.acquire("/normal")
+
+        async def grant_then_timeout(futures, timeout):
+            # 타임아웃과 같은 시점에 슬롯이 배정되는 경우 재현
+            controller.release("/normal")
+            return set(), set(futures)
+
+        monkeypatch.setattr(admission.asyncio, "wait", grant_then_timeout)
+        with pytest.raises(Overloaded):
+            await controller.acquire("/normal")
+        assert controller.inflight == 0
+        assert controller._waiters == []
+
+    asyncio.run(scenario())
+
+
+def test_timed_out_waiter_leaves_queue():
+    async def scenario():
+        controller = make_controller(max_inflight=1, reserved=0, policies={
+            **POLICIES, "/normal": {**POLICIES["/normal"], "max_wait": 0.01}
+        })
+        await controller.acquire("/normal")
+        with pytest.raises(Overloaded):
+            await controller.acquire("/normal")
+        assert controller._waiters == []
+
+        controller.release("/normal")
+        assert controller.inflight == 0
+
+    asyncio.run(scenario())
+
+
+async def call(middleware, path: str, token: str = "user-token") -> int:
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 1234),
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+    return sent[0]["status"]
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def test_low_priority_burst_does_not_exhaust_critical_bucket():
+    async def scenario():
+        controller = AdmissionController(workers=1)
+        middleware = AdmissionMiddleware(ok_app, controller, resolve_principal=lambda token: "alice")
+
+        statuses = [await call(middleware, "/api/voice/query") for _ in range(5)]
+        assert statuses == [200, 200, 200, 200, 429]
+        assert await call(middleware, "/api/location/risk") == 200
+
+    asyncio.run(scenario())
+
+
+def test_rate_limit_split_across_workers():
+    controller = AdmissionController(workers=4)
+    assert controller.limiter.rate == admission.RATE_LIMIT_RATE / 4
+    # 가장 비싼 요청 한 번은 항상 가능
+    assert controller.limiter.burst == max(admission.RATE_LIMIT_BURST / 4, 5)
+
+
+def test_worker_count_read_after_fork(monkeypatch):
+    # preload_app: 컨트롤러는 마스터에서 만들어지고, 워커 수는 on_starting에서 설정됨
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    controller = AdmissionController()
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    assert controller.limiter.rate == admission.RATE_LIMIT_RATE / 4
+
+
+def test_unknown_paths_share_one_stats_key():
+    async def scenario():
+        controller = AdmissionController(workers=1)
+        middleware = AdmissionMiddleware(ok_app, controller, resolve_principal=lambda token: None)
+        for i in range(20):
+            await call(middleware, f"/probe/{i}")
+        assert set(controller.stats) == {admission.OTHER_ROUTE}
+        assert set(controller.route_inflight) == {admission.OTHER_ROUTE}
+        assert controller.stats[admission.OTHER_ROUTE].admitted == 20
+
+    asyncio.run(scenario())
+
+
+def test_metrics_aggregate_across_worker_snapshots(tmp_path):
+    first = make_controller()
+    first.route_stats("/crit").admitted = 3
+    first.route_stats("/crit").observe_queue_time(0.002)
+    first.write_snapshot(str(tmp_path))
+
+    second = make_controller()
+    second.route_stats("/crit").admitted = 2
+    second.route_stats("/crit").observe_queue_time(0.2)
+    fresh = {"pid": 1, "written_at": time.time(), **second.metrics()}
+    (tmp_path / "admission-1.json").write_text(json.dumps(fresh))
+
+    # 종료된 워커의 오래된 스냅샷은 제외
+    stale = {**fresh, "pid": 2, "written_at": 0}
+    (tmp_path / "admission-2.json").write_text(json.dumps(stale))
+
+    merged = admission.merge_metrics(admission.read_snapshots(str(tmp_path)))
+    assert len(merged["workers"]) == 2
+    crit = merged["routes"]["/crit"]
+    assert crit["admitted"] == 5
+    assert crit["queue_time"]["count"] == 2
+    assert crit["queue_time"]["max"] == 0.2
+    assert sum(crit["queue_time"]["buckets"].values()) == 2
+
+
+def test_snapshot_removed_on_shutdown(tmp_path):
+    async def scenario():
+        controller = make_controller()
+        task = asyncio.create_task(controller.export_snapshots(str(tmp_path), interval=0.01))
+        await asyncio.sleep(0.03)
+        assert len(admission.read_snapshots(str(tmp_path))) == 1
+
+        # main.on_shutdown과 같은 순서: 태스크 중지 후 스냅샷 삭제
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        controller.remove_snapshot(str(tmp_path))
+        assert list(tmp_path.iterdir()) == []
+        # 이미 없는 경우에도 오류 없음
+        controller.remove_snapshot(str(tmp_path))
+
+    asyncio.run(scenario())
+
+
+def test_snapshot_write_failure_is_logged(tmp_path, caplog):
+    async def scenario():
+        controller = make_controller()
+        task = asyncio.create_task(controller.export_snapshots(str(tmp_path / "missing"), interval=0.01))
+        await asyncio.sleep(0.02)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with caplog.at_level(logging.WARNING, logger="admission"):
+        asyncio.run(scenario())
+    assert "수용 제어 지표 저장 실패" in caplog.text
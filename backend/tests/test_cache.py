@@ -0,0 +1,182 @@
+# backend/tests/test_cache.py
+import asyncio
+import logging
+import sys
+import types
+
+import httpx
+import pytest
+
+import cache
+import utils
+from cache import LocalCache, RedisCache
+
+
+def test_local_cache_ttl(monkeypatch):
+    async def scenario():
+        now = [100.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        local = LocalCache()
+        await local.set("a", 1, ttl=10)
+        await local.set("b", 2)
+
+        now[0] += 9
+        assert await local.get("a") == 1
+        now[0] += 2
+        assert await local.get("a") is None
+        assert "a" not in local._data
+        # TTL 없는 항목은 만료되지 않음
+        assert await local.get("b") == 2
+
+    asyncio.run(scenario())
+
+
+def test_local_cache_evicts_oldest():
+    async def scenario():
+        local = LocalCache(max_entries=2)
+        await local.set("a", 1)
+        await local.set("b", 2)
+        # 기존 키 갱신은 제거를 일으키지 않음
+        await local.set("a", 3)
+        await local.set("c", 4)
+        assert await local.get("a") is None
+        assert await local.get("b") == 2
+        assert await local.get("c") == 4
+
+    asyncio.run(scenario())
+
+
+class FakeRedis:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.data = {}
+        self.expiry = {}
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        client = cls(fail="down" in url)
+        client.kwargs = kwargs
+        return client
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("connection refused")
+
+    async def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value
+        self.expiry[key] = ex
+
+    async def delete(self, key):
+        self._check()
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    module = types.ModuleType("redis.asyncio")
+    module.Redis = FakeRedis
+    package = types.ModuleType("redis")
+    package.asyncio = module
+    monkeypatch.setitem(sys.modules, "redis", package)
+    monkeypatch.setitem(sys.modules, "redis.asyncio", module)
+    return module
+
+
+def test_redis_cache_round_trip(fake_redis):
+    async def scenario():
+        redis_cache = RedisCache("redis://localhost:6379/0", prefix="sinkhole:test:")
+        assert redis_cache.client.kwargs["socket_timeout"] == cache.CACHE_TIMEOUT
+
+        await redis_cache.set("k", {"probability": 0.4}, ttl=30)
+        assert redis_cache.client.expiry["sinkhole:test:k"] == 30
+        assert await redis_cache.get("k") == {"probability": 0.4}
+        await redis_cache.delete("k")
+        assert await redis_cache.get("k") is None
+
+    asyncio.run(scenario())
+
+
+def test_redis_cache_fails_open(fake_redis, caplog):
+    async def scenario():
+        redis_cache = RedisCache("redis://down:6379/0")
+        with caplog.at_level(logging.WARNING, logger="cache"):
+            assert await redis_cache.get("k") is None
+            await redis_cache.set("k", 1, ttl=30)
+            await redis_cache.delete("k")
+        assert len(caplog.records) == 3
+
+    asyncio.run(scenario())
+
+
+def test_get_cache_without_redis_package(monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_URL", "redis://localhost:6379/0")
+    monkeypatch.setattr(cache, "_caches", {})
+    monkeypatch.setitem(sys.modules, "redis", None)
+    assert isinstance(cache.get_cache("risk_grid"), LocalCache)
+
+
+class FakeAsyncClient:
+    """httpx.AsyncClient 대체 (응답 순서대로 반환, 호출 횟수 기록)"""
+    responses = []
+    calls = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def post(self, url, json=None, timeout=None):
+        FakeAsyncClient.calls += 1
+        response = FakeAsyncClient.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def ml_server(monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_URL", "")
+    monkeypatch.setattr(cache, "_caches", {})
+    monkeypatch.setattr(utils.httpx, "AsyncClient", FakeAsyncClient)
+    FakeAsyncClient.responses = []
+    FakeAsyncClient.calls = 0
+    return FakeAsyncClient
+
+
+def fetch(lat: float = 37.5665, lng: float = 126.978):
+    return asyncio.run(utils.fetch_risk_assessment(lat, lng, 1000, "http://ml/predict", 300))
+
+
+def test_risk_assessment_cached_per_grid_cell(ml_server):
+    ml_server.responses = [httpx.Response(200, json={"risk_level": "low", "probability": 0.1})]
+    assert fetch(37.5661, 126.9781)["probability"] == 0.1
+    # 같은 격자(소수점 셋째 자리)는 캐시에서 응답
+    assert fetch(37.5663, 126.9783)["probability"] == 0.1
+    assert ml_server.calls == 1
+
+
+@pytest.mark.parametrize("response", [
+    httpx.Response(500, json={"detail": "model not loaded"}),
+    httpx.Response(200, json={"detail": "no prediction"}),
+    httpx.Response(200, json=[0.1]),
+])
+def test_invalid_risk_response_not_cached(ml_server, response):
+    ml_server.responses = [response, httpx.Response(200, json={"probability": 0.2})]
+    fetch()
+    assert fetch()["probability"] == 0.2
+    assert ml_server.calls == 2
+
+
+def test_risk_fallback_not_cached(ml_server):
+    ml_server.responses = [
+        httpx.ConnectError("connection refused"),
+        httpx.Response(200, json={"probability": 0.2}),
+    ]
+    assert fetch()["probability"] == 0.35
+    assert fetch()["probability"] == 0.2
@@ -0,0 +1,128 @@
+# backend/tests/test_geocoder.py
+import random
+
+import pytest
+
+import geocoder
+from geocoder import DEFAULT_ADDRESSES, FUZZY_THRESHOLD, Geocoder, load_address_entries
+from utils import calculate_distance
+from bench_geocoder import make_seoul_addresses
+
+REPRO_NAME = "서울특별시 도봉구 나가동 691-34"
+
+
+def make_geocoder(*names: str) -> Geocoder:
+    return Geocoder([{"name": name, "lat": 37.5 + i * 0.01, "lng": 127.0} for i, name in enumerate(names)])
+
+
+def test_contained_match_prefers_longest_name():
+    index = make_geocoder("강남", "강남역", "종로")
+    assert index.geocode("서울 강남역 2번 출구")["name"] == "강남역"
+    assert index.geocode("강남역")["score"] == 1.0
+
+
+def test_contained_match_only_at_word_start():
+    index = make_geocoder("구역", "강남역")
+    # "강남구 역삼동"의 "구역"은 단어 경계를 넘는 부분 문자열
+    assert index.geocode("강남구 역삼동") is None
+    assert index.geocode("재개발 구역 입구")["name"] == "구역"
+
+
+def test_short_contained_name_does_not_beat_full_address():
+    index = make_geocoder("도봉구", REPRO_NAME)
+    result = index.geocode("서울 도봉구 나가동 691-34번지")
+    assert result["name"] == REPRO_NAME
+    assert result["score"] == pytest.approx(0.917, abs=0.001)
+
+
+def test_fuzzy_match_threshold():
+    index = Geocoder(DEFAULT_ADDRESSES)
+    result = index.geocode("홍대입구")
+    assert result["name"] == "홍대입구역"
+    assert FUZZY_THRESHOLD <= result["score"] < 1.0
+    assert index.geocode("청담동") is None
+
+
+def test_fuzzy_score_exact_with_common_ngrams(monkeypatch):
+    # 구/동 이름 n-gram이 모두 비트맵으로 저장되는 경우에도 점수가 정확해야 함
+    monkeypatch.setattr(geocoder, "MAX_POSTINGS", 20)
+    entries = make_seoul_addresses(3000)
+    index = Geocoder(entries)
+    assert index.ngram_bitmaps
+
+    result = index.geocode("서울 도봉구 나가동 691-34번지")
+    assert result["name"] == REPRO_NAME
+    assert result["score"] == pytest.approx(0.917, abs=0.001)
+
+
+def test_fuzzy_match_with_only_common_ngrams(monkeypatch):
+    monkeypatch.setattr(geocoder, "MAX_POSTINGS", 1)
+    index = make_geocoder("강남역", "강남역 1번 출구", "종로")
+    assert "강남" in index.ngram_bitmaps
+    result = index.geocode("강남")
+    assert result["name"] == "강남역"
+    assert result["score"] == pytest.approx(2 / 3, abs=0.001)
+
+
+def test_formatted_address_has_single_city_prefix():
+    index = make_geocoder(REPRO_NAME, "서울시청", "종로")
+    assert index.geocode(REPRO_NAME)["formatted_address"] == REPRO_NAME
+    assert index.geocode("서울시청")["formatted_address"] == "서울특별시 서울시청"
+    assert index.geocode("종로")["formatted_address"] == "서울특별시 종로"
+
+
+def test_load_address_entries(tmp_path):
+    path = tmp_path / "addresses.csv"
+    path.write_text(
+        "name,latitude,longitude,address\n"
+        "광화문,37.5759,126.9768,서울특별시 종로구 세종로\n"
+        "잘못된 행,abc,126.9\n"
+        "서울역,37.5547,126.9706,\n",
+        encoding="utf-8"
+    )
+    entries = load_address_entries(str(path))
+    assert [e["name"] for e in entries] == ["광화문", "서울역"]
+    assert entries[0]["address"] == "서울특별시 종로구 세종로"
+    assert entries[1]["address"] is None
+
+
+def test_load_address_entries_falls_back_to_defaults(tmp_path):
+    assert load_address_entries(str(tmp_path / "missing.csv")) == DEFAULT_ADDRESSES
+
+    path = tmp_path / "empty.csv"
+    path.write_text("name,latitude,longitude\n잘못된 행,,\n", encoding="utf-8")
+    assert load_address_entries(str(path)) == DEFAULT_ADDRESSES
+
+
+def brute_force_nearest(entries, lat, lng, max_distance):
+    best = None
+    for entry in entries:
+        distance = calculate_distance(lat, lng, entry["lat"], entry["lng"])
+        if distance <= max_distance and (best is None or distance < best):
+            best = distance
+    return best
+
+
+@pytest.mark.parametrize("max_distance", [50, 500, 5000])
+def test_reverse_geocode_matches_brute_force(max_distance):
+    rng = random.Random(3)
+    entries = [
+        {"name": f"지점{i}", "lat": 37.45 + rng.random() * 0.25, "lng": 126.8 + rng.random() * 0.4}
+        for i in range(3000)
+    ]
+    index = Geocoder(entries)
+
+    for _ in range(200):
+        lat, lng = 37.44 + rng.random() * 0.27, 126.79 + rng.random() * 0.42
+        expected = brute_force_nearest(entries, lat, lng, max_distance)
+        result = index.reverse_geocode(lat, lng, max_distance=max_distance)
+        if expected is None:
+            assert result is None
+        else:
+            assert result["distance"] == pytest.approx(expected, abs=0.01)
+
+
+def test_reverse_geocode_outside_max_distance():
+    index = make_geocoder("서울시청")
+    assert index.reverse_geocode(37.5, 127.01, max_distance=500) is None
+    assert index.reverse_geocode(37.5, 127.001, max_distance=500)["name"] == "서울시청"
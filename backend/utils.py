@@ -5,6 +5,15 @@ import asyncio
 from typing import Dict, List, Tuple, Any
 import os
 
+from cache import get_cache
+
+# 임시 위험지역 데이터 (실제로는 DB에서 조회, 읽기 전용)
+HIGH_RISK_AREAS = (
+    {"lat": 37.5510, "lng": 126.9882, "radius": 200, "risk": 0.8},
+    {"lat": 37.5660, "lng": 126.9784, "radius": 150, "risk": 0.7},
+    {"lat": 37.5400, "lng": 127.0000, "radius": 300, "risk": 0.9}
+)
+
 def validate_coordinates(latitude: float, longitude: float) -> bool:
     """좌표 유효성 검사"""
     # 서울시 대략적인 경계
@@ -53,13 +62,6 @@ async def calculate_safe_route(
 ) -> Dict[str, Any]:
     """안전 경로 계산"""
     
-    # 임시 위험지역 데이터 (실제로는 DB에서 조회)
-    high_risk_areas = [
-        {"lat": 37.5510, "lng": 126.9882, "radius": 200, "risk": 0.8},
-        {"lat": 37.5660, "lng": 126.9784, "radius": 150, "risk": 0.7},
-        {"lat": 37.5400, "lng": 127.0000, "radius": 300, "risk": 0.9}
-    ]
-    
     try:
         # Google Maps Directions API 사용 (실제 구현 시)
         # 여기서는 더미 데이터 반환
@@ -73,7 +75,7 @@ async def calculate_safe_route(
         warnings = []
         
         if avoid_high_risk:
-            for risk_area in high_risk_areas:
+            for risk_area in HIGH_RISK_AREAS:
                 # 경로가 위험지역을 지나는지 간단히 확인
                 risk_distance_start = calculate_distance(
                     start_lat, start_lng, 
@@ -124,24 +126,13 @@ async def calculate_safe_route(
 
 async def geocode_address(address: str) -> Dict[str, Any]:
     """주소를 좌표로 변환"""
+    # 지연 임포트 (geocoder가 utils.calculate_distance를 사용)
+    from geocoder import cached_geocode
     try:
-        # Google Geocoding API 또는 Kakao Map API 사용
-        # 여기서는 더미 데이터 반환
-        seoul_addresses = {
-            "서울시청": {"lat": 37.5665, "lng": 126.9780},
-            "강남역": {"lat": 37.4979, "lng": 127.0276},
-            "홍대입구역": {"lat": 37.5563, "lng": 126.9236},
-            "종로": {"lat": 37.5694, "lng": 126.9769}
-        }
-        
-        for key, coords in seoul_addresses.items():
-            if key in address:
-                return {
-                    "latitude": coords["lat"],
-                    "longitude": coords["lng"],
-                    "formatted_address": f"서울특별시 {key}",
-                    "success": True
-                }
+        # 로컬 주소 인덱스 조회 (단어 경계 포함 매칭 + n-gram 퍼지 매칭 중 점수가 높은 쪽, LRU 캐시)
+        result = cached_geocode(address)
+        if result is not None:
+            return dict(result)
         
         # 기본값
         return {
@@ -158,6 +149,78 @@ async def geocode_address(address: str) -> Dict[str, Any]:
             "message": f"주소 변환 실패: {str(e)}"
         }
 
+async def reverse_geocode(latitude: float, longitude: float, max_distance: float = 500) -> Dict[str, Any]:
+    """좌표를 주소로 변환 (max_distance 미터 이내 가장 가까운 주소)"""
+    from geocoder import get_geocoder
+    try:
+        # 좌표는 캐시 적중이 드물어 격자 색인을 바로 조회
+        result = get_geocoder().reverse_geocode(latitude, longitude, max_distance)
+        if result is not None:
+            return result
+        
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "success": False,
+            "message": "주변에서 주소를 찾을 수 없습니다."
+        }
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"좌표 변환 실패: {str(e)}"
+        }
+
+async def fetch_risk_assessment(
+    latitude: float,
+    longitude: float,
+    radius: int,
+    endpoint: str,
+    ttl: int
+) -> Dict[str, Any]:
+    """ML 모델 위험도 조회 (약 100m 격자 단위 캐시)"""
+    risk_cache = get_cache("risk_grid")
+    cache_key = f"{latitude:.3f}:{longitude:.3f}:{radius}"
+    risk_data = await risk_cache.get(cache_key)
+    if risk_data is not None:
+        return risk_data
+
+    async with httpx.AsyncClient() as client:
+        try:
+            response = await client.post(
+                endpoint,
+                json={
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "radius": radius
+                },
+                timeout=10
+            )
+            risk_data = response.json()
+            # 정상 응답만 캐시 (ML 서버 오류가 TTL 동안 남지 않도록)
+            if response.is_success and isinstance(risk_data, dict) and "probability" in risk_data:
+                await risk_cache.set(cache_key, risk_data, ttl=ttl)
+            return risk_data
+        except httpx.RequestError:
+            # ML 모델 서버가 없을 때 더미 데이터
+            return {
+                "risk_level": "medium",
+                "probability": 0.35,
+                "factors": [
+                    "Old water pipes in area",
+                    "High rainfall last month",
+                    "Subway construction nearby"
+                ],
+                "nearby_risks": [
+                    {
+                        "latitude": latitude + 0.001,
+                        "longitude": longitude + 0.001,
+                        "risk_level": "high",
+                        "probability": 0.78
+                    }
+                ]
+            }
+
 def format_risk_level(probability: float) -> str:
     """위험도를 문자열로 변환"""
     if probability >= 0.8:
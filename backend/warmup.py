@@ -0,0 +1,31 @@
+# backend/warmup.py
+import logging
+import time
+
+from utils import HIGH_RISK_AREAS
+
+logger = logging.getLogger(__name__)
+
+_warmed = False
+
+
+def warm_shared_data() -> float:
+    """읽기 전용 데이터 미리 로드 (fork 전에 호출하면 워커들이 copy-on-write로 공유)
+
+    반환값: 로드에 걸린 시간 (초)
+    """
+    global _warmed
+    if _warmed:
+        return 0.0
+
+    started = time.perf_counter()
+
+    # 주소 검색 인덱스 (정렬 이름 배열, n-gram 역색인, 격자 색인)
+    from geocoder import get_geocoder
+    geocoder = get_geocoder()
+
+    elapsed = time.perf_counter() - started
+    logger.info("공유 데이터 로드 완료: 주소 %d건, 위험지역 %d건 (%.2fs)", len(geocoder), len(HIGH_RISK_AREAS), elapsed)
+
+    _warmed = True
+    return elapsed